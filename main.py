@@ -1,13 +1,23 @@
 import streamlit as st
+import csv
+import io
 import os
 from datetime import datetime
 import json
 import re
 from typing import Dict, List, Optional
 from langchain_groq import ChatGroq
+from groq import BadRequestError
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage, AIMessage
-import pandas as pd
+from langchain.schema import HumanMessage, AIMessage, LLMResult
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.globals import get_llm_cache, set_llm_cache
+from langchain_community.cache import SQLiteCache
+from utils import extract_years_experience, find_email, normalize_phone
+
+# Cache LLM responses on disk so identical prompts skip the Groq round-trip across reruns
+if get_llm_cache() is None:
+    set_llm_cache(SQLiteCache(database_path=".talentscout_cache.db"))
 
 # Page configuration
 st.set_page_config(
@@ -18,7 +28,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better UI
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main {
         padding-top: 2rem;
@@ -26,42 +36,6 @@ st.markdown("""
     .stTextInput > div > div > input {
         background-color: #f0f2f6;
     }
-    .chat-message div {
-        color: #000000  
-    }
-    .chat-message {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-        display: flex;
-        align-items: flex-start;
-    }
-    .chat-message.user {
-        background-color: #e8f4fd;
-        color: #000000; 
-    }
-    .chat-message.bot {
-        background-color: #f0f2f6;
-        color: #000000;
-    }
-    .chat-message .avatar {
-        width: 40px;
-        height: 40px;
-        border-radius: 50%;
-        margin-right: 1rem;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.2rem;
-    }
-    .user .avatar {
-        background-color: #007bff;
-        color: white;
-    }
-    .bot .avatar {
-        background-color: #28a745;
-        color: white;
-    }
     .sidebar-content {
         background-color: #f8f9fa;
         padding: 1rem;
@@ -69,17 +43,124 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+# Streamlit drops elements that a rerun does not emit again, so the styles are written on every run
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Avatars shown next to chat messages, by role
+CHAT_AVATARS = {"user": "👤", "assistant": "🤖"}
+
+# Candidate fields gathered before the technical round, mapped to their description
+CANDIDATE_FIELDS = {
+    'name': 'full name',
+    'email': 'email address',
+    'phone': 'phone number',
+    'experience': 'years of experience',
+    'position': 'desired position',
+    'location': 'location',
+    'tech_stack': 'technology stack',
+}
+
+# Keywords that end the conversation, matched against the words (and word pairs) of the input
+CHAT_END_KEYWORDS = frozenset({'bye', 'goodbye', 'exit', 'quit', 'end', 'finish', 'done', 'thank you'})
+WORD_RE = re.compile(r'\w+')
+
+# Number of technical questions generated and evaluated per batched LLM call
+MAX_QUESTION_BATCH = 4
+
+# Static system prompts. They contain no template variables, so every call shares a
+# bit-identical prefix that Groq can serve from its prompt cache.
+EXTRACTION_INSTRUCTIONS = """Return only the requested field's value from the text, or NOT_FOUND if absent.
+e.g. name: "Hi, I'm John Doe" -> John Doe; experience: "I have 5 years of experience" -> 5; tech stack: "I know Python, React, and MongoDB" -> Python, React, MongoDB
+"""
+
+BATCH_EXTRACTION_INSTRUCTIONS = f"""Extract candidate details from the transcript as a JSON object with keys: {', '.join(CANDIDATE_FIELDS)}. Use null if missing. JSON only.
+e.g. "I have 5 years of experience" -> experience "5"; "I know Python, React, and MongoDB" -> tech_stack "Python, React, MongoDB"
+"""
+
+QUESTION_INSTRUCTIONS = f"""Write {MAX_QUESTION_BATCH} clear, practical technical questions on different aspects of the given tech stack, basic to intermediate, each with a short rubric of what a strong answer covers.
+Return a JSON object: "questions" list of objects with "q" and "rubric" keys.
+"""
+
+# Uncompressed prompts, retried when a reply to the compressed prompt is not valid JSON
+_LEGACY_EXTRACTION_PROMPT = f"""Extract the candidate's details from the interview transcript.
+Return a JSON object with exactly these keys: {', '.join(CANDIDATE_FIELDS)}.
+Use null for any value that is not found. Return only the JSON object, nothing else.
+
+Examples:
+- name: "Hi, I'm John Doe" -> "John Doe"
+- email: "My email is john@example.com" -> "john@example.com"
+- experience: "I have 5 years of experience" -> "5"
+- tech_stack: "I know Python, React, and MongoDB" -> "Python, React, MongoDB"
+"""
+
+_LEGACY_QUESTION_PROMPT = f"""Generate {MAX_QUESTION_BATCH} technical questions for a candidate based on their tech stack.
+The questions should be relevant, practical, and assess different aspects of their knowledge.
+For each question, also write a short rubric describing what a strong answer should cover.
+
+Requirements:
+- Questions should be clear and specific
+- Cover different difficulty levels (basic to intermediate)
+- Focus on practical application, not just theory
+- Return a JSON object with a "questions" key holding a list of objects with "q" and "rubric" keys
+
+Example question:
+q: How would you handle state management in a large React application?
+rubric: Mentions lifting state, context or a store library, and trade-offs for performance
+"""
+
+EVALUATION_INSTRUCTIONS = """Evaluate the candidate's answers to the following technical questions.
+Each item is identified by its position in square brackets, e.g. [1].
+Score each answer from 0 to 10 against its rubric.
+
+Return a JSON object with a "scores" key holding a list of objects with
+"index", "score" and "feedback" keys, one per item, in the same order.
+"""
+
+# Maximum prompt + completion tokens spent on a single candidate's interview
+CANDIDATE_TOKEN_BUDGET = 20000
+
+class TokenCounter(BaseCallbackHandler):
+    """Accumulate token usage reported by the LLM across calls"""
+    
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+    
+    def on_llm_end(self, response: LLMResult, **kwargs) -> None:
+        """Add the usage of a finished call, skipping responses replayed from the LLM cache"""
+        # Cache hits are returned without llm_output, while Groq calls always report token_usage there
+        if not response.llm_output:
+            return
+        
+        token_usage = response.llm_output.get("token_usage") or {}
+        self.prompt_tokens += token_usage.get("prompt_tokens", 0)
+        self.completion_tokens += token_usage.get("completion_tokens", 0)
+        self.total_tokens += token_usage.get("total_tokens", 0)
+
+def is_json_validation_error(error: BadRequestError) -> bool:
+    """Check whether a Groq 400 was raised because JSON-mode output failed validation"""
+    body = error.body if isinstance(error.body, dict) else {}
+    details = body.get("error", body)
+    return isinstance(details, dict) and details.get("code") == "json_validate_failed"
+
+@st.cache_resource
+def get_llm(groq_api_key: str) -> ChatGroq:
+    """Create the Groq client once per API key so its HTTP connection pool is reused across reruns"""
+    return ChatGroq(
+        groq_api_key=groq_api_key,
+        model_name="llama3-70b-8192",
+        temperature=0.1
+    )
 
 class HiringAssistant:
     def __init__(self):
         self.groq_api_key = self._get_groq_api_key()
+        self.token_counter = TokenCounter()
         if self.groq_api_key:
-            self.llm = ChatGroq(
-                groq_api_key=self.groq_api_key,
-                model_name="llama3-70b-8192",
-                temperature=0.1
-            )
+            # The client is shared, so the per-candidate counter is attached per call
+            self.llm = get_llm(self.groq_api_key).with_config(callbacks=[self.token_counter])
         else:
             self.llm = None
         
@@ -87,6 +168,25 @@ class HiringAssistant:
         self.candidate_info = {}
         self.tech_questions = []
         self.current_question_index = 0
+        self.evaluation = {}
+        
+        # Build prompt templates once; the hot path only formats them
+        self._extract_tmpl = ChatPromptTemplate.from_messages([
+            ("system", EXTRACTION_INSTRUCTIONS),
+            ("human", "Field to extract: {field}\nText: {text}")
+        ])
+        self._batch_extract_tmpls = [
+            ChatPromptTemplate.from_messages([("system", instructions), ("human", "Transcript:\n{transcript}")])
+            for instructions in (BATCH_EXTRACTION_INSTRUCTIONS, _LEGACY_EXTRACTION_PROMPT)
+        ]
+        self._questions_tmpls = [
+            ChatPromptTemplate.from_messages([("system", instructions), ("human", "Tech Stack: {tech_stack}")])
+            for instructions in (QUESTION_INSTRUCTIONS, _LEGACY_QUESTION_PROMPT)
+        ]
+        self._evaluation_tmpl = ChatPromptTemplate.from_messages([
+            ("system", EVALUATION_INSTRUCTIONS),
+            ("human", "Items:\n{items}")
+        ])
         
     def _get_groq_api_key(self) -> Optional[str]:
         """Get Groq API key from environment or user input"""
@@ -98,135 +198,206 @@ class HiringAssistant:
         
         return st.session_state.groq_api_key
     
-    def extract_candidate_info(self, user_input: str, field: str) -> str:
-        """Extract specific information from user input using LLM"""
+    def _fast_extract(self, user_input: str, field: str) -> Optional[str]:
+        """Extract trivially parseable fields with regex, returning None when there is no match"""
+        if field == "email address":
+            return find_email(user_input)
+        if field == "phone number":
+            return normalize_phone(user_input)
+        if field == "years of experience":
+            return extract_years_experience(user_input)
+        return None
+    
+    def _invoke_json(self, prompts: List[ChatPromptTemplate], **values) -> Dict:
+        """Invoke the LLM in JSON mode, trying each prompt in turn until a reply parses as JSON"""
+        llm = self.llm.bind(response_format={"type": "json_object"})
+        for prompt in prompts[:-1]:
+            try:
+                return json.loads(llm.invoke(prompt.format_messages(**values)).content)
+            except json.JSONDecodeError:
+                continue
+            except BadRequestError as e:
+                # Groq rejects invalid JSON-mode output server-side with a 400 (json_validate_failed);
+                # any other bad request would fail the same way with the next prompt
+                if not is_json_validation_error(e):
+                    raise
+        return json.loads(llm.invoke(prompts[-1].format_messages(**values)).content)
+    
+    def extract_all(self, transcript: str) -> Dict[str, Optional[str]]:
+        """Extract all candidate fields from the interview transcript in a single LLM call"""
         if not self.llm:
-            return user_input.strip()
-            
-        prompt = ChatPromptTemplate.from_template(
-            """Extract the {field} from the following text. Return only the extracted value, nothing else.
-            If the information is not found, return 'NOT_FOUND'.
-            
-            Text: {text}
-            
-            Field to extract: {field}
-            
-            Examples:
-            - For name: "Hi, I'm John Doe" -> "John Doe"
-            - For email: "My email is john@example.com" -> "john@example.com"
-            - For experience: "I have 5 years of experience" -> "5"
-            - For tech stack: "I know Python, React, and MongoDB" -> "Python, React, MongoDB"
-            """
-        )
+            return self._extract_each()
         
         try:
-            response = self.llm.invoke(prompt.format_messages(field=field, text=user_input))
-            result = response.content.strip()
-            return result if result != 'NOT_FOUND' else user_input.strip()
+            extracted = self._invoke_json(self._batch_extract_tmpls, transcript=transcript)
+            return {key: extracted.get(key) for key in CANDIDATE_FIELDS}
         except Exception as e:
-            st.error(f"Error extracting information: {str(e)}")
-            return user_input.strip()
+            st.error(f"Error extracting information, retrying field by field: {str(e)}")
+            return self._extract_each()
+    
+    def _extract_each(self) -> Dict[str, Optional[str]]:
+        """Extract each candidate field separately from its buffered raw answer, sending LLM lookups concurrently"""
+        raw = {key: self.candidate_info.get(f"_raw_{key}", "") for key in CANDIDATE_FIELDS}
+        extracted = {key: self._fast_extract(raw[key], field) for key, field in CANDIDATE_FIELDS.items()}
+        pending = [key for key, value in extracted.items() if value is None]
+        
+        if not self.llm or not pending:
+            extracted.update({key: raw[key].strip() for key in pending})
+            return extracted
+        
+        responses = self.llm.batch(
+            [self._extract_tmpl.format_messages(field=CANDIDATE_FIELDS[key], text=raw[key]) for key in pending],
+            return_exceptions=True
+        )
+        
+        for key, response in zip(pending, responses):
+            if isinstance(response, Exception):
+                st.error(f"Error extracting information: {str(response)}")
+                result = 'NOT_FOUND'
+            else:
+                result = response.content.strip()
+            extracted[key] = result if result != 'NOT_FOUND' else raw[key].strip()
+        return extracted
+    
+    def _build_transcript(self) -> str:
+        """Concatenate the buffered raw answers into a labelled transcript"""
+        return "\n".join(
+            f"{field.capitalize()}: {self.candidate_info.get(f'_raw_{key}', '')}"
+            for key, field in CANDIDATE_FIELDS.items()
+        )
     
-    def generate_technical_questions(self, tech_stack: str) -> List[str]:
-        """Generate technical questions based on tech stack"""
+    def _finalize_candidate_info(self):
+        """Run the batched extraction once and replace the raw answers with extracted values"""
+        extracted = self.extract_all(self._build_transcript())
+        for key, field in CANDIDATE_FIELDS.items():
+            raw = self.candidate_info.pop(f"_raw_{key}", "").strip()
+            # Regex matches are exact, so they take precedence over the LLM's answer
+            value = self._format_value(self._fast_extract(raw, field) or extracted.get(key))
+            self.candidate_info[key] = value or raw
+    
+    def _format_value(self, value) -> str:
+        """Render an extracted JSON value as text, joining lists (and object values) with commas"""
+        if value is None:
+            return ""
+        if isinstance(value, (list, tuple)):
+            return ", ".join(filter(None, (self._format_value(item) for item in value)))
+        if isinstance(value, dict):
+            return ", ".join(filter(None, (self._format_value(item) for item in value.values())))
+        return str(value).strip()
+    
+    def generate_technical_questions(self, tech_stack: str) -> List[Dict[str, Optional[str]]]:
+        """Generate technical questions with reference rubrics based on tech stack"""
         if not self.llm:
             return [
-                f"Can you explain your experience with {tech_stack}?",
-                f"What projects have you worked on using {tech_stack}?",
-                f"What are some best practices you follow when working with {tech_stack}?"
+                {"q": f"Can you explain your experience with {tech_stack}?", "rubric": None},
+                {"q": f"What projects have you worked on using {tech_stack}?", "rubric": None},
+                {"q": f"What are some best practices you follow when working with {tech_stack}?", "rubric": None}
             ]
         
-        prompt = ChatPromptTemplate.from_template(
-            """Generate 4 technical questions for a candidate based on their tech stack.
-            The questions should be relevant, practical, and assess different aspects of their knowledge.
-            
-            Tech Stack: {tech_stack}
-            
-            Requirements:
-            - Questions should be clear and specific
-            - Cover different difficulty levels (basic to intermediate)
-            - Focus on practical application, not just theory
-            - Each question should be on a new line starting with "Q:"
-            
-            Example format:
-            Q: Can you explain the difference between let, const, and var in JavaScript?
-            Q: How would you handle state management in a large React application?
-            """
-        )
-        
         try:
-            response = self.llm.invoke(prompt.format_messages(tech_stack=tech_stack))
-            questions = []
-            for line in response.content.strip().split('\n'):
-                if line.strip().startswith('Q:'):
-                    questions.append(line.strip()[2:].strip())
-            return questions[:4] if questions else [f"Tell me about your experience with {tech_stack}"]
+            questions = [
+                {"q": item["q"].strip(), "rubric": item.get("rubric")}
+                for item in self._invoke_json(self._questions_tmpls, tech_stack=tech_stack).get("questions", [])
+                if isinstance(item, dict) and item.get("q")
+            ]
+            return questions[:MAX_QUESTION_BATCH] if questions else [
+                {"q": f"Tell me about your experience with {tech_stack}", "rubric": None}
+            ]
         except Exception as e:
             st.error(f"Error generating questions: {str(e)}")
-            return [f"Tell me about your experience with {tech_stack}"]
+            return [{"q": f"Tell me about your experience with {tech_stack}", "rubric": None}]
+    
+    def evaluate_answers_batch(self) -> Dict:
+        """Evaluate all technical answers against their rubrics in a single LLM call"""
+        if not self.llm or not self.tech_questions:
+            return {}
+        
+        items = [
+            f"[{index}] Question: {question['q']}\n"
+            f"Rubric: {question.get('rubric') or 'Use your judgement'}\n"
+            f"Answer: {self.candidate_info.get(f'answer_{index}', '')}"
+            for index, question in enumerate(self.tech_questions[:MAX_QUESTION_BATCH], start=1)
+        ]
+        
+        try:
+            response = self.llm.bind(response_format={"type": "json_object"}).invoke(
+                self._evaluation_tmpl.format_messages(items="\n\n".join(items))
+            )
+            return json.loads(response.content)
+        except Exception as e:
+            st.error(f"Error evaluating answers: {str(e)}")
+            return {}
+    
+    def evaluation_scores(self) -> List[Dict]:
+        """Return the per-answer entries of the evaluation scorecard, ordered by question"""
+        scores = self.evaluation.get("scores", []) if isinstance(self.evaluation, dict) else []
+        return [entry for entry in scores if isinstance(entry, dict)]
     
     def get_bot_response(self, user_input: str) -> str:
         """Generate appropriate bot response based on conversation state"""
         user_input_lower = user_input.lower().strip()
         
         # Check for conversation ending keywords
-        end_keywords = ['bye', 'goodbye', 'exit', 'quit', 'end', 'finish', 'done', 'thank you']
-        if any(keyword in user_input_lower for keyword in end_keywords):
+        words = WORD_RE.findall(user_input_lower)
+        tokens = frozenset(words).union(f"{a} {b}" for a, b in zip(words, words[1:]))
+        if tokens & CHAT_END_KEYWORDS:
             return self._end_conversation()
         
+        # Stop spending tokens once this candidate's budget is used up
+        if self.conversation_state != "completed" and self.token_counter.total_tokens > CANDIDATE_TOKEN_BUDGET:
+            self.conversation_state = "completed"
+            return "⚠️ We've reached the processing limit for this interview. Your responses so far have been recorded for review. Thank you! 🙏"
+        
         if self.conversation_state == "greeting":
             return self._handle_greeting()
         
         elif self.conversation_state == "collect_name":
-            name = self.extract_candidate_info(user_input, "full name")
-            self.candidate_info['name'] = name
+            self.candidate_info['_raw_name'] = user_input
             self.conversation_state = "collect_email"
-            return f"Nice to meet you, {name}! 📧 Could you please provide your email address?"
+            return "Nice to meet you! 📧 Could you please provide your email address?"
         
         elif self.conversation_state == "collect_email":
-            email = self.extract_candidate_info(user_input, "email address")
             # Simple email validation
-            if '@' in email and '.' in email:
-                self.candidate_info['email'] = email
+            if find_email(user_input):
+                self.candidate_info['_raw_email'] = user_input
                 self.conversation_state = "collect_phone"
                 return "Great! 📱 What's your phone number?"
             else:
                 return "Please provide a valid email address (e.g., john@example.com)"
         
         elif self.conversation_state == "collect_phone":
-            phone = self.extract_candidate_info(user_input, "phone number")
-            self.candidate_info['phone'] = phone
+            self.candidate_info['_raw_phone'] = user_input
             self.conversation_state = "collect_experience"
             return "Perfect! 💼 How many years of experience do you have in your field?"
         
         elif self.conversation_state == "collect_experience":
-            experience = self.extract_candidate_info(user_input, "years of experience")
-            self.candidate_info['experience'] = experience
+            self.candidate_info['_raw_experience'] = user_input
             self.conversation_state = "collect_position"
             return "Excellent! 🎯 What position(s) are you interested in applying for?"
         
         elif self.conversation_state == "collect_position":
-            position = self.extract_candidate_info(user_input, "desired position")
-            self.candidate_info['position'] = position
+            self.candidate_info['_raw_position'] = user_input
             self.conversation_state = "collect_location"
             return "Awesome! 📍 What's your current location (city, state/country)?"
         
         elif self.conversation_state == "collect_location":
-            location = self.extract_candidate_info(user_input, "location")
-            self.candidate_info['location'] = location
+            self.candidate_info['_raw_location'] = user_input
             self.conversation_state = "collect_tech_stack"
             return "Perfect! 💻 Now, please tell me about your tech stack. What programming languages, frameworks, databases, and tools are you proficient in?"
         
         elif self.conversation_state == "collect_tech_stack":
-            tech_stack = self.extract_candidate_info(user_input, "technology stack")
-            self.candidate_info['tech_stack'] = tech_stack
+            self.candidate_info['_raw_tech_stack'] = user_input
+            
+            # Extract all buffered answers in one pass
+            self._finalize_candidate_info()
+            tech_stack = self.candidate_info['tech_stack']
             
             # Generate technical questions
             self.tech_questions = self.generate_technical_questions(tech_stack)
             self.current_question_index = 0
             self.conversation_state = "technical_questions"
             
-            return f"Great! Based on your tech stack ({tech_stack}), I'll ask you a few technical questions to assess your skills.\n\n🔍 **Question 1:** {self.tech_questions[0]}"
+            return f"Great! Based on your tech stack ({tech_stack}), I'll ask you a few technical questions to assess your skills.\n\n🔍 **Question 1:** {self.tech_questions[0]['q']}"
         
         elif self.conversation_state == "technical_questions":
             # Store the answer
@@ -236,9 +407,10 @@ class HiringAssistant:
             self.current_question_index += 1
             
             if self.current_question_index < len(self.tech_questions):
-                return f"Thank you for your answer! 👍\n\n🔍 **Question {self.current_question_index + 1}:** {self.tech_questions[self.current_question_index]}"
+                return f"Thank you for your answer! 👍\n\n🔍 **Question {self.current_question_index + 1}:** {self.tech_questions[self.current_question_index]['q']}"
             else:
                 self.conversation_state = "completed"
+                self.evaluation = self.evaluate_answers_batch()
                 return self._complete_interview()
         
         elif self.conversation_state == "completed":
@@ -322,38 +494,55 @@ def main():
                 st.rerun()
         else:
             st.success("✅ AI Assistant Ready!")
+            st.caption(
+                f"🔢 Tokens used: {st.session_state.hiring_assistant.token_counter.total_tokens:,}"
+                f" / {CANDIDATE_TOKEN_BUDGET:,}"
+            )
         
         st.markdown("---")
         
+        # Raw answers are buffered under _raw_ keys until extraction runs, so leave them out
+        candidate_info = {
+            key: value
+            for key, value in st.session_state.hiring_assistant.candidate_info.items()
+            if not key.startswith('_raw_')
+        }
+        
         # Display candidate information
         st.markdown("### 📋 Candidate Information")
-        if st.session_state.hiring_assistant.candidate_info:
+        if candidate_info:
             info_container = st.container()
             with info_container:
-                for key, value in st.session_state.hiring_assistant.candidate_info.items():
+                for key, value in candidate_info.items():
                     if not key.startswith('answer_'):
                         st.markdown(f"**{key.title()}:** {value}")
         else:
             st.markdown("*Information will appear here as you chat*")
         
+        # Display the technical evaluation once the interview is scored
+        evaluation_scores = st.session_state.hiring_assistant.evaluation_scores()
+        if evaluation_scores:
+            st.markdown("### 🧪 Technical Evaluation")
+            for entry in evaluation_scores:
+                st.markdown(f"**Answer {entry.get('index')}:** {entry.get('score')}/10 - {entry.get('feedback', '')}")
+        
         st.markdown("---")
         
         # Export functionality
-        if st.session_state.hiring_assistant.candidate_info:
+        if candidate_info:
             st.markdown("### 💾 Export Data")
             if st.button("📊 Download Candidate Data"):
-                # Create DataFrame
-                data = {
-                    'Field': list(st.session_state.hiring_assistant.candidate_info.keys()),
-                    'Value': list(st.session_state.hiring_assistant.candidate_info.values())
-                }
-                df = pd.DataFrame(data)
-                
-                # Convert to CSV
-                csv = df.to_csv(index=False)
+                # Write Field,Value rows straight from the candidate info and evaluation
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(["Field", "Value"])
+                writer.writerows(candidate_info.items())
+                for entry in evaluation_scores:
+                    writer.writerow([f"score_{entry.get('index')}", entry.get('score')])
+                    writer.writerow([f"feedback_{entry.get('index')}", entry.get('feedback', '')])
                 st.download_button(
                     label="Download CSV",
-                    data=csv,
+                    data=buffer.getvalue(),
                     file_name=f"candidate_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
@@ -364,20 +553,8 @@ def main():
     # Display chat history
     with chat_container:
         for message in st.session_state.chat_history:
-            if message["role"] == "user":
-                st.markdown(f"""
-                <div class="chat-message user">
-                    <div class="avatar">👤</div>
-                    <div>{message["content"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="chat-message bot">
-                    <div class="avatar">🤖</div>
-                    <div>{message["content"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
+            with st.chat_message(message["role"], avatar=CHAT_AVATARS[message["role"]]):
+                st.markdown(message["content"])
     
     # Start conversation button or input
     if not st.session_state.conversation_started:
@@ -2,11 +2,87 @@
 Utility functions for TalentScout Hiring Assistant
 """
 
+import csv
+import io
 import re
-import json
-from typing import Dict, List, Optional
+import orjson
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Precompiled patterns used by the helpers below
+_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+_EMAIL_RE = re.compile(f'^{_EMAIL_PATTERN}$')
+_EMAIL_SEARCH_RE = re.compile(_EMAIL_PATTERN)
+_NONDIGIT_RE = re.compile(r'\D')
+_NUMBER_RE = re.compile(r'\b(\d+)\b')
+_YEARS_RES = [
+    re.compile(pattern) for pattern in [
+        r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)',
+        r'(\d+(?:\.\d+)?)\s*(?:year|yr)',
+        r'(\d+)\+?\s*(?:years?|yrs?)',
+    ]
+]
+
+# Common technology categories and their keywords
+TECH_CATEGORIES = {
+    'languages': [
+        'python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'php', 
+        'ruby', 'swift', 'kotlin', 'typescript', 'scala', 'r', 'matlab'
+    ],
+    'frameworks': [
+        'react', 'angular', 'vue', 'django', 'flask', 'fastapi', 'express',
+        'spring', 'laravel', 'rails', 'nextjs', 'nuxt', 'svelte', 'ember'
+    ],
+    'databases': [
+        'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle',
+        'cassandra', 'elasticsearch', 'dynamodb', 'firestore'
+    ],
+    'cloud': [
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
+        'jenkins', 'gitlab', 'github actions', 'heroku', 'vercel'
+    ],
+    'tools': [
+        'git', 'jira', 'figma', 'photoshop', 'vscode', 'intellij',
+        'postman', 'slack', 'trello', 'notion', 'confluence'
+    ]
+}
+
+# Reverse lookup from technology keyword to its category
+_TECH_TO_CATEGORY = {
+    tech: category for category, techs in TECH_CATEGORIES.items() for tech in techs
+}
+# Technology tokens, keeping "++"/"#" suffixes such as "c++" and "c#" while "+" still separates words
+_TECH_TOKEN_RE = re.compile(r'\w+(?:\+\+|#)?')
+
+# Translation table deleting characters stripped by sanitize_input
+_SANITIZE_TABLE = str.maketrans('', '', '<>"\'%;()&+')
+
+# Keywords that suggest different question difficulty levels
+_BEGINNER_KEYWORDS = [
+    'what is', 'define', 'explain', 'basic', 'introduction', 'simple'
+]
+
+_INTERMEDIATE_KEYWORDS = [
+    'how would you', 'implement', 'design', 'optimize', 'compare',
+    'difference between', 'best practices'
+]
+
+_ADVANCED_KEYWORDS = [
+    'architecture', 'scalability', 'performance', 'security', 'complex',
+    'enterprise', 'microservices', 'system design'
+]
+
+def _keyword_re(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into one alternation, longest first so overlapping keywords match fully"""
+    return re.compile('|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+_BEGINNER_RE = _keyword_re(_BEGINNER_KEYWORDS)
+_INTERMEDIATE_RE = _keyword_re(_INTERMEDIATE_KEYWORDS)
+_ADVANCED_RE = _keyword_re(_ADVANCED_KEYWORDS)
+
 def validate_email(email: str) -> bool:
     """
     Validate email format using regex
@@ -17,8 +93,7 @@ def validate_email(email: str) -> bool:
     Returns:
         bool: True if email is valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def validate_phone(phone: str) -> bool:
     """
@@ -30,10 +105,35 @@ def validate_phone(phone: str) -> bool:
     Returns:
         bool: True if phone is valid, False otherwise
     """
+    return normalize_phone(phone) is not None
+
+def find_email(text: str) -> Optional[str]:
+    """
+    Find the first email address in free text
+    
+    Args:
+        text (str): Text that may contain an email address
+        
+    Returns:
+        Optional[str]: The email address or None
+    """
+    match = _EMAIL_SEARCH_RE.search(text)
+    return match.group(0) if match else None
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """
+    Reduce a phone number to its digits
+    
+    Args:
+        phone (str): Phone number in any format
+        
+    Returns:
+        Optional[str]: The digits, or None if there are not 10-15 of them
+    """
     # Remove all non-digit characters
-    cleaned_phone = re.sub(r'\D', '', phone)
+    cleaned_phone = _NONDIGIT_RE.sub('', phone)
     # Check if it's between 10-15 digits (international format)
-    return 10 <= len(cleaned_phone) <= 15
+    return cleaned_phone if 10 <= len(cleaned_phone) <= 15 else None
 
 def extract_years_experience(text: str) -> Optional[str]:
     """
@@ -45,20 +145,14 @@ def extract_years_experience(text: str) -> Optional[str]:
     Returns:
         Optional[str]: Extracted years or None
     """
-    patterns = [
-        r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)',
-        r'(\d+(?:\.\d+)?)\s*(?:year|yr)',
-        r'(\d+)\+?\s*(?:years?|yrs?)',
-    ]
-    
     text_lower = text.lower()
-    for pattern in patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _YEARS_RES:
+        match = pattern.search(text_lower)
         if match:
             return match.group(1)
     
     # Look for standalone numbers that might represent years
-    numbers = re.findall(r'\b(\d+)\b', text)
+    numbers = _NUMBER_RE.findall(text)
     if numbers:
         # Return the first reasonable number (between 0 and 50)
         for num in numbers:
@@ -77,50 +171,26 @@ def parse_tech_stack(tech_stack: str) -> Dict[str, List[str]]:
     Returns:
         Dict[str, List[str]]: Categorized technologies
     """
-    # Common technology categories and their keywords
-    categories = {
-        'languages': [
-            'python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'php', 
-            'ruby', 'swift', 'kotlin', 'typescript', 'scala', 'r', 'matlab'
-        ],
-        'frameworks': [
-            'react', 'angular', 'vue', 'django', 'flask', 'fastapi', 'express',
-            'spring', 'laravel', 'rails', 'nextjs', 'nuxt', 'svelte', 'ember'
-        ],
-        'databases': [
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle',
-            'cassandra', 'elasticsearch', 'dynamodb', 'firestore'
-        ],
-        'cloud': [
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
-            'jenkins', 'gitlab', 'github actions', 'heroku', 'vercel'
-        ],
-        'tools': [
-            'git', 'jira', 'figma', 'photoshop', 'vscode', 'intellij',
-            'postman', 'slack', 'trello', 'notion', 'confluence'
-        ]
-    }
-    
-    tech_stack_lower = tech_stack.lower()
-    parsed = {category: [] for category in categories}
-    
-    for category, techs in categories.items():
-        for tech in techs:
-            if tech in tech_stack_lower:
-                parsed[category].append(tech.title())
-    
-    # Add uncategorized items
+    parsed = {category: [] for category in TECH_CATEGORIES}
     parsed['other'] = []
-    words = re.findall(r'\b\w+\b', tech_stack)
-    for word in words:
-        word_lower = word.lower()
-        found = False
-        for category_techs in categories.values():
-            if word_lower in category_techs:
-                found = True
-                break
-        if not found and len(word) > 2:
-            parsed['other'].append(word.title())
+    seen = set()
+    
+    tokens = _TECH_TOKEN_RE.findall(tech_stack.lower())
+    i = 0
+    while i < len(tokens):
+        # Prefer two-word technologies such as "github actions"
+        pair = f"{tokens[i]} {tokens[i + 1]}" if i + 1 < len(tokens) else None
+        if pair in _TECH_TO_CATEGORY:
+            tech, i = pair, i + 2
+        else:
+            tech, i = tokens[i], i + 1
+        
+        category = _TECH_TO_CATEGORY.get(tech)
+        if category is None and len(tech) <= 2:
+            continue
+        if tech not in seen:
+            seen.add(tech)
+            parsed[category or 'other'].append(tech.title())
     
     return {k: v for k, v in parsed.items() if v}  # Remove empty categories
 
@@ -134,35 +204,35 @@ def generate_candidate_summary(candidate_info: Dict) -> str:
     Returns:
         str: Formatted candidate summary
     """
-    summary = []
-    summary.append(f"📋 **CANDIDATE SUMMARY**")
-    summary.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    summary.append("")
-    
-    # Basic Information
-    summary.append("**📝 Personal Information:**")
-    summary.append(f"• Name: {candidate_info.get('name', 'N/A')}")
-    summary.append(f"• Email: {candidate_info.get('email', 'N/A')}")
-    summary.append(f"• Phone: {candidate_info.get('phone', 'N/A')}")
-    summary.append(f"• Location: {candidate_info.get('location', 'N/A')}")
-    summary.append("")
-    
-    # Professional Information
-    summary.append("**💼 Professional Information:**")
-    summary.append(f"• Experience: {candidate_info.get('experience', 'N/A')} years")
-    summary.append(f"• Position Interest: {candidate_info.get('position', 'N/A')}")
-    summary.append(f"• Tech Stack: {candidate_info.get('tech_stack', 'N/A')}")
-    summary.append("")
-    
-    # Technical Answers
-    summary.append("**🔍 Technical Assessment:**")
-    answer_count = 0
-    for key, value in candidate_info.items():
-        if key.startswith('answer_'):
-            answer_count += 1
-            summary.append(f"• Answer {answer_count}: {value[:100]}{'...' if len(value) > 100 else ''}")
-    
-    if answer_count == 0:
+    get = candidate_info.get
+    answers = [value for key, value in candidate_info.items() if key.startswith('answer_')]
+    
+    summary = [
+        "📋 **CANDIDATE SUMMARY**",
+        f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        # Basic Information
+        "**📝 Personal Information:**",
+        f"• Name: {get('name', 'N/A')}",
+        f"• Email: {get('email', 'N/A')}",
+        f"• Phone: {get('phone', 'N/A')}",
+        f"• Location: {get('location', 'N/A')}",
+        "",
+        # Professional Information
+        "**💼 Professional Information:**",
+        f"• Experience: {get('experience', 'N/A')} years",
+        f"• Position Interest: {get('position', 'N/A')}",
+        f"• Tech Stack: {get('tech_stack', 'N/A')}",
+        "",
+        # Technical Answers
+        "**🔍 Technical Assessment:**",
+    ]
+    summary.extend(
+        f"• Answer {index}: {value[:100]}{'...' if len(value) > 100 else ''}"
+        for index, value in enumerate(answers, start=1)
+    )
+    
+    if not answers:
         summary.append("• No technical answers recorded")
     
     return "\n".join(summary)
@@ -178,7 +248,7 @@ def sanitize_input(user_input: str) -> str:
         str: Sanitized input
     """
     # Remove potentially harmful characters
-    sanitized = re.sub(r'[<>\"\'%;()&+]', '', user_input)
+    sanitized = user_input.translate(_SANITIZE_TABLE)
     # Limit length
     sanitized = sanitized[:500]
     # Strip whitespace
@@ -222,25 +292,10 @@ def get_question_difficulty_level(question: str, tech_stack: str) -> str:
     """
     question_lower = question.lower()
     
-    # Keywords that suggest different difficulty levels
-    beginner_keywords = [
-        'what is', 'define', 'explain', 'basic', 'introduction', 'simple'
-    ]
-    
-    intermediate_keywords = [
-        'how would you', 'implement', 'design', 'optimize', 'compare',
-        'difference between', 'best practices'
-    ]
-    
-    advanced_keywords = [
-        'architecture', 'scalability', 'performance', 'security', 'complex',
-        'enterprise', 'microservices', 'system design'
-    ]
-    
-    # Count keyword matches
-    beginner_score = sum(1 for keyword in beginner_keywords if keyword in question_lower)
-    intermediate_score = sum(1 for keyword in intermediate_keywords if keyword in question_lower)
-    advanced_score = sum(1 for keyword in advanced_keywords if keyword in question_lower)
+    # Count distinct keyword matches
+    beginner_score = len(set(_BEGINNER_RE.findall(question_lower)))
+    intermediate_score = len(set(_INTERMEDIATE_RE.findall(question_lower)))
+    advanced_score = len(set(_ADVANCED_RE.findall(question_lower)))
     
     # Determine level based on scores
     if advanced_score > 0 or 'senior' in tech_stack.lower():
@@ -264,25 +319,19 @@ def export_candidate_data(candidate_info: Dict, format_type: str = 'json') -> st
     if format_type.lower() == 'json':
         # Add metadata
         export_data = {
-            'export_timestamp': datetime.now().isoformat(),
+            'export_timestamp': datetime.now(),
             'candidate_data': candidate_info,
             'summary': generate_candidate_summary(candidate_info)
         }
-        return json.dumps(export_data, indent=2, ensure_ascii=False)
+        # orjson serializes datetimes natively and keeps non-ASCII text as UTF-8
+        return orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
     
     elif format_type.lower() == 'csv':
-        # Convert to CSV format
-        import io
+        # Convert to CSV format; csv.writer handles quoting and escaping
         output = io.StringIO()
-        
-        # Write headers and data
-        output.write("Field,Value\n")
-        for key, value in candidate_info.items():
-            # Escape commas and quotes in values
-            escaped_value = str(value).replace('"', '""')
-            if ',' in escaped_value:
-                escaped_value = f'"{escaped_value}"'
-            output.write(f"{key},{escaped_value}\n")
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(("Field", "Value"))
+        writer.writerows((key, str(value)) for key, value in candidate_info.items())
         
         return output.getvalue()
     
@@ -307,9 +356,8 @@ def calculate_interview_score(candidate_info: Dict) -> Dict[str, any]:
     }
     
     # Calculate completion score (40% of total)
-    required_fields = ['name', 'email', 'phone', 'experience', 'position', 'location', 'tech_stack']
-    completed_fields = sum(1 for field in required_fields if candidate_info.get(field))
-    completion_percentage = (completed_fields / len(required_fields)) * 100
+    completed_fields = sum(1 for field in REQUIRED_FIELDS if candidate_info.get(field))
+    completion_percentage = (completed_fields / len(REQUIRED_FIELDS)) * 100
     score_breakdown['completion_score'] = completion_percentage * 0.4
     
     # Calculate response quality score (60% of total)
@@ -349,6 +397,72 @@ def calculate_interview_score(candidate_info: Dict) -> Dict[str, any]:
     
     return score_breakdown
 
+def calculate_interview_scores_bulk(candidates: List[Dict]) -> 'pd.DataFrame':
+    """
+    Calculate interview scores for many candidates in one vectorized pass
+    
+    Produces the same scores and recommendations as calculate_interview_score
+    for each candidate.
+    
+    Args:
+        candidates (List[Dict]): Candidate information dictionaries
+        
+    Returns:
+        pd.DataFrame: One row per candidate with completion_score,
+            response_quality_score, total_score and recommendations columns
+    """
+    import numpy as np
+    import pandas as pd
+    
+    df = pd.DataFrame(candidates)
+    
+    # Completion score (40% of total)
+    completed = df.reindex(columns=REQUIRED_FIELDS).fillna('').astype(bool)
+    completion_percentage = completed.sum(axis=1) / len(REQUIRED_FIELDS) * 100
+    completion_score = completion_percentage * 0.4
+    
+    # Response quality score (60% of total), based on average answer length.
+    # Lengths are taken from the raw dicts so that present-but-None answers count
+    # as str(None), as in calculate_interview_score, rather than becoming NaN.
+    lengths = pd.DataFrame(
+        [
+            {key: len(str(value)) for key, value in candidate.items() if key.startswith('answer_')}
+            for candidate in candidates
+        ],
+        index=df.index
+    )
+    avg_answer_length = lengths.mean(axis=1).reindex(df.index)
+    quality_score = np.select(
+        [avg_answer_length > 100, avg_answer_length > 50, avg_answer_length > 20, avg_answer_length.notna()],
+        [90, 75, 60, 40],
+        default=0
+    )
+    response_quality_score = pd.Series(quality_score * 0.6, index=df.index)
+    
+    total_score = completion_score + response_quality_score
+    
+    # Generate recommendations
+    overall = np.select(
+        [total_score >= 80, total_score >= 60],
+        ["Excellent candidate - recommend for next round", "Good candidate - consider for interview"],
+        default="May need additional screening"
+    )
+    recommendations = [
+        (["Complete all required information fields"] if incomplete else [])
+        + (["Provide more detailed technical answers"] if low_quality else [])
+        + [verdict]
+        for incomplete, low_quality, verdict in zip(
+            completion_percentage < 100, response_quality_score < 50, overall.tolist()
+        )
+    ]
+    
+    return pd.DataFrame({
+        'completion_score': completion_score,
+        'response_quality_score': response_quality_score,
+        'total_score': total_score,
+        'recommendations': recommendations
+    }, index=df.index)
+
 # Constants for the application
 CONVERSATION_STATES = [
     "greeting",
@@ -363,6 +477,8 @@ CONVERSATION_STATES = [
     "completed"
 ]
 
+REQUIRED_FIELDS = ['name', 'email', 'phone', 'experience', 'position', 'location', 'tech_stack']
+
 END_KEYWORDS = [
     'bye', 'goodbye', 'exit', 'quit', 'end', 'finish', 'done', 'thank you',
     'thanks', 'stop', 'close', 'terminate'